@@ -0,0 +1,84 @@
+"""
+Memory benchmark: list of CourseMembership models vs. columnar Table.
+
+Builds a synthetic JSON:API membership response (decoded with 'json.loads', so
+every string is a separate object just like a real response) and measures the
+memory retained by both result formats.
+
+Usage: PYTHONPATH=src python benchmarks/columnar_memory.py [rows]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+import uuid
+
+from studip_jsonapi.columnar import Table
+from studip_jsonapi.models import CourseMembership
+
+PERMISSIONS = ("autor", "autor", "autor", "autor", "tutor", "dozent")
+
+
+def makeResponse(rows, courses=200):
+    courseIds = [uuid.uuid4().hex for _ in range(courses)]
+    items = [
+        {
+            "type": "course-memberships",
+            "id": uuid.uuid4().hex,
+            "attributes": {"permission": PERMISSIONS[i % len(PERMISSIONS)]},
+            "relationships": {
+                "course": {"data": {"type": "courses", "id": courseIds[i % courses]}},
+                "user": {"data": {"type": "users", "id": uuid.uuid4().hex}},
+            },
+        }
+        for i in range(rows)
+    ]
+    return json.dumps({"data": items})
+
+
+def measure(build, payload):
+    """Returns the bytes still allocated after 'build' consumed a freshly decoded payload."""
+    gc.collect()
+    tracemalloc.start()
+    items = json.loads(payload)["data"]
+    result = build(items)
+    del items
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    payload = makeResponse(rows)
+
+    models, modelBytes, modelPeak = measure(
+        lambda items: [CourseMembership.createFromResponse(item) for item in items],
+        payload,
+    )
+    table, tableBytes, tablePeak = measure(
+        lambda items: Table.fromModels(
+            CourseMembership,
+            (CourseMembership.createFromResponse(item) for item in items),
+        ),
+        payload,
+    )
+    assert table.toModels() == models
+
+    print("rows: {}".format(rows))
+    print(
+        "list of models: {:8.1f} MiB retained, {:8.1f} MiB peak".format(
+            modelBytes / 2**20, modelPeak / 2**20
+        )
+    )
+    print(
+        "columnar table: {:8.1f} MiB retained, {:8.1f} MiB peak".format(
+            tableBytes / 2**20, tablePeak / 2**20
+        )
+    )
+    print("ratio: {:.2f}x".format(modelBytes / tableBytes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Throughput benchmark of the HTTP transports against a local HTTP/1.1 keep-alive server.
+
+Every transport fetches the same small JSON:API document through Client._get:
+first from many threads, like the bulk helpers do, reporting requests per second;
+then sequentially from a single thread, reporting per-request latency percentiles
+(i.e. the overhead of a single request over a warm keep-alive connection).
+The local server speaks plain HTTP/1.1, so HttpxTransport is measured without
+HTTP/2 multiplexing here.
+
+Usage: PYTHONPATH=src python benchmarks/transport_throughput.py [requests] [threads]
+"""
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from requests import Session
+
+from studip_jsonapi.client import Client
+from studip_jsonapi.transport import HttpxTransport, RequestsTransport
+
+BODY = json.dumps({"data": {"type": "users", "id": "me"}}).encode("utf-8")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # Headers and body are sent separately
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.api+json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(client, url, requests, threads):
+    client._get(url)  # warm up
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda _: client._get(url), range(requests)):
+            pass
+    return time.perf_counter() - start
+
+
+def latencies(client, url, requests):
+    """Returns the sorted wall times (in ms) of sequential requests."""
+    client._get(url)  # warm up
+    times = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client._get(url)
+        times.append(1000 * (time.perf_counter() - start))
+    return sorted(times)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    base = "http://127.0.0.1:{}".format(server.server_address[1])
+    url = base + "/users/me"
+
+    transports = {
+        "requests (default pool)": lambda: RequestsTransport(Session()),
+        "requests (poolSize={})".format(threads): lambda: RequestsTransport(
+            Session(), poolSize=threads
+        ),
+    }
+    try:
+        import httpx  # noqa: F401
+
+        transports["httpx"] = lambda: HttpxTransport(Session(), http2=False)
+    except ImportError:
+        print("httpx not installed, skipping HttpxTransport")
+
+    print("Throughput: {} requests, {} threads".format(requests, threads))
+    for name, makeTransport in transports.items():
+        transport = makeTransport()
+        elapsed = run(Client(None, base, transport=transport), url, requests, threads)
+        transport.close()
+        print("{:28} {:8.0f} req/s".format(name, requests / elapsed))
+
+    print("Latency: {} sequential requests, 1 thread".format(requests))
+    for name, makeTransport in transports.items():
+        transport = makeTransport()
+        times = latencies(Client(None, base, transport=transport), url, requests)
+        transport.close()
+        print(
+            "{:28} mean {:6.3f} ms  p50 {:6.3f} ms  p99 {:6.3f} ms".format(
+                name,
+                sum(times) / len(times),
+                times[len(times) // 2],
+                times[int(len(times) * 0.99)],
+            )
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import warnings
+from dataclasses import dataclass
+from threading import Lock
+
+"""
+Helpers for bulk operations spanning many courses.
+"""
+
+
+def announcementHash(announcement):
+    """
+    Content hash of a CreateAnnouncement. Only title, content and comment setting
+    are considered, so re-running with a fresh publication start yields the same hash.
+    """
+    content = json.dumps(
+        [announcement.title, announcement.content, announcement.commentsAllowed]
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class AnnouncementJournal:
+    """
+    Local idempotency journal for bulk announcement publishing.
+
+    Every successful post is appended as one JSON line ({"course": ..., "hash": ...})
+    to the file at 'path' and flushed immediately, so an interrupted run keeps track of
+    every course that already received the announcement. Partially written lines
+    (e.g. from a killed run) are skipped with a warning.
+
+    Workers must 'reserve' a (course, hash) pair before posting, then either
+    'record' it after success or 'release' it after failure. A pair that is done
+    or reserved by another worker cannot be reserved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._done = set()
+        self._pending = set()
+        self._needsNewline = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Later runs terminate such a line, so it may also appear mid-file
+                        warnings.warn(
+                            "Skipping incomplete line of journal {}: {!r}".format(
+                                path, line
+                            )
+                        )
+                        continue
+                    self._done.add((entry["course"], entry["hash"]))
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    self._needsNewline = f.read(1) != b"\n"
+
+    def contains(self, cid, contentHash):
+        with self._lock:
+            return (cid, contentHash) in self._done
+
+    def reserve(self, cid, contentHash):
+        """Returns True if the caller may post, i.e. the pair is neither done nor in flight."""
+        with self._lock:
+            key = (cid, contentHash)
+            if key in self._done or key in self._pending:
+                return False
+            self._pending.add(key)
+            return True
+
+    def release(self, cid, contentHash):
+        """Gives up a reservation without recording it, e.g. after a failed post."""
+        with self._lock:
+            self._pending.discard((cid, contentHash))
+
+    def record(self, cid, contentHash):
+        with self._lock:
+            key = (cid, contentHash)
+            if key in self._done:
+                return
+            # The reservation is kept if writing fails, so the pair is not posted again in this run
+            line = json.dumps({"course": cid, "hash": contentHash}) + "\n"
+            if self._needsNewline:
+                line = "\n" + line  # Terminate a partial line left by a killed run
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._needsNewline = False
+            self._pending.discard(key)
+            self._done.add(key)
+
+
+@dataclass
+class BulkResult:
+    """
+    Per-course outcome of a bulk operation.
+    status is one of 'posted', 'skipped' (already in the journal), 'failed' or
+    'unrecorded' (posted, but writing the journal failed; 'error' holds the reason).
+    """
+
+    courseId: str
+    status: str
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.status != "failed"
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from urllib.parse import urlencode
 from .models import (
@@ -12,6 +13,9 @@ from .models import (
     CreateFile,
     CreateMessage,
 )
+from .columnar import Table
+from .bulk import AnnouncementJournal, BulkResult, announcementHash
+from .transport import RequestsTransport
 
 class Client:
     """
@@ -22,23 +26,28 @@ class Client:
 
     apiBaseUrl: URL to JSON:API endpoint, including version and without trailing slash.
     e.g., `https://studip.example.com/jsonapi.php/v1`
+
+    transport: Optional transport performing the HTTP requests (see 'transport.py').
+    Defaults to a RequestsTransport wrapping 'session' unchanged. If a transport
+    is given, 'session' may be None.
     """
 
-    def __init__(self, session, apiBaseUrl):
+    def __init__(self, session, apiBaseUrl, transport=None):
         self.apiBaseUrl = apiBaseUrl
         self.session = session
+        self.transport = transport if transport is not None else RequestsTransport(session)
 
     #
     # Stage 0: Plain HTTP requests
     #
 
     def _get(self, url):
-        r = self.session.get(url)
+        r = self.transport.get(url)
         r.raise_for_status()
         return r
 
     def _post(self, url, headers, json):
-        r = self.session.post(url, headers=headers, json=json)
+        r = self.transport.post(url, headers=headers, json=json)
         r.raise_for_status()
         return r.json()
 
@@ -47,7 +56,7 @@ class Client:
             "file": content
         }  # Use a generic name and overwrite it using the 'Slug' header
         headers = {"Slug": filename}
-        r = self.session.post(url, files=files, headers=headers)
+        r = self.transport.post(url, files=files, headers=headers)
         r.raise_for_status()
 
     #
@@ -59,7 +68,7 @@ class Client:
         assert "data" in json
         return obj.createFromResponse(json["data"])
 
-    def _apiGetCollection(self, url, obj, limit=10000, params={}, data_field="data"):
+    def _apiGetCollectionItems(self, url, limit=10000, params={}, data_field="data"):
         params.update({"page[limit]": limit})
 
         json = self._get(
@@ -68,13 +77,35 @@ class Client:
             )
         ).json()
         assert data_field in json
-        return [obj.createFromResponse(item) for item in json[data_field]]
+        return json[data_field]
+
+    def _apiGetCollection(self, url, obj, limit=10000, params={}, data_field="data"):
+        items = self._apiGetCollectionItems(url, limit, params, data_field)
+        return [obj.createFromResponse(item) for item in items]
+
+    def _apiGetTable(self, url, obj, limit=10000, params={}, data_field="data", table=None):
+        """
+        Like _apiGetCollection, but collects the models into a column-oriented Table.
+        Rows are appended to 'table' if given, otherwise a new Table is created.
+        Only the retained memory shrinks; the decoded response and a temporary
+        model per row still exist while filling, so peak memory is unchanged.
+        """
+        items = self._apiGetCollectionItems(url, limit, params, data_field)
+        if table is None:
+            table = Table(obj)
+        table.extend(obj.createFromResponse(item) for item in items)
+        return table
 
-    def _apiPost(self, url, data, respObj=None):
-        """Post to a JSON:API compatible URL. Provided payload data must be JSON-encodable."""
+    def _apiPost(self, url, data=None, respObj=None, payload=None):
+        """
+        Post to a JSON:API compatible URL. Provided payload data must be JSON-encodable.
+        A prebuilt request body can be passed as 'payload' instead of 'data'.
+        """
+        if payload is None:
+            payload = {"data": data.toJSON()}
         json = self._post(
             "{base}/{path}".format(base=self.apiBaseUrl, path=url),
-            json={"data": data.toJSON()},
+            json=payload,
             headers={"Content-Type": "application/vnd.api+json"},
         )
         if respObj:
@@ -93,6 +124,10 @@ class Client:
         """
         return self._apiGetCollection("users", User)
 
+    def getUsersTable(self):
+        """Like getUsers, but returns a column-oriented Table instead of a list."""
+        return self._apiGetTable("users", User)
+
     def getUserById(self, userId):
         return self._apiGetSingle("users/{}".format(userId), User)
 
@@ -135,6 +170,19 @@ class Client:
             params=params,
         )
 
+    def getCourseMembershipsTable(self, cid, permission=None, table=None):
+        """
+        Like getCourseMemberships, but returns a column-oriented Table.
+        Pass an existing Table to collect memberships of several courses.
+        """
+        params={"filter[permission]": permission} if permission else {}
+        return self._apiGetTable(
+            "courses/{}/memberships".format(cid),
+            CourseMembership,
+            params=params,
+            table=table,
+        )
+
     def getCourseMembershipUsers(self, cid, permission=None):
         """
         Returns member users of a given course.
@@ -173,6 +221,45 @@ class Client:
             "courses/{}/news".format(cid), data=CreateAnnouncement(topic, body)
         )
 
+    def postCourseAnnouncements(
+        self, cids, topic, body, journal=None, maxWorkers=8, **announcementArgs
+    ):
+        """
+        Post the same announcement to many courses concurrently, using at most
+        'maxWorkers' parallel requests. Duplicate course ids are posted only once.
+
+        journal: Optional path to a local idempotency journal (or an AnnouncementJournal).
+        Courses recorded in the journal with the same announcement content are
+        skipped, so an interrupted run can simply be repeated.
+
+        Further keyword arguments are passed on to CreateAnnouncement.
+        Returns a list of BulkResult, one per distinct course, in the order of 'cids'.
+        """
+        announcement = CreateAnnouncement(topic, body, **announcementArgs)
+        contentHash = announcementHash(announcement)
+        payload = {"data": announcement.toJSON()}  # Built once, shared by all requests
+        if journal is not None and not isinstance(journal, AnnouncementJournal):
+            journal = AnnouncementJournal(journal)
+
+        def publish(cid):
+            if journal is not None and not journal.reserve(cid, contentHash):
+                return BulkResult(cid, "skipped")
+            try:
+                self._apiPost("courses/{}/news".format(cid), payload=payload)
+            except Exception as e:
+                if journal is not None:
+                    journal.release(cid, contentHash)
+                return BulkResult(cid, "failed", e)
+            if journal is not None:
+                try:
+                    journal.record(cid, contentHash)
+                except Exception as e:
+                    return BulkResult(cid, "unrecorded", e)
+            return BulkResult(cid, "posted")
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            return list(executor.map(publish, dict.fromkeys(cids)))
+
     ## Messages
     def postMessage(self, subject, body, recipients):
         self._apiPost("messages", data=CreateMessage(subject, body, recipients))
@@ -186,10 +273,20 @@ class Client:
         """Retrieves all FileRefs of a course, regardless of directory structure."""
         return self._apiGetCollection("courses/{}/file-refs".format(cid), FileRef)
 
+    def getCourseFilesTable(self, cid, table=None):
+        """Like getCourseFiles, but returns a column-oriented Table."""
+        return self._apiGetTable(
+            "courses/{}/file-refs".format(cid), FileRef, table=table
+        )
+
     def getCourseFolders(self, cid):
         """Returns all Folders in a course."""
         return self._apiGetCollection("courses/{}/folders".format(cid), Folder)
 
+    def getCourseFoldersTable(self, cid, table=None):
+        """Like getCourseFolders, but returns a column-oriented Table."""
+        return self._apiGetTable("courses/{}/folders".format(cid), Folder, table=table)
+
     def getFolderFiles(self, fid):
         """Returns all FileRefs in a folder (does not search in sub-directories)."""
         return self._apiGetCollection("folders/{}/file-refs".format(fid), FileRef)
@@ -232,6 +329,13 @@ class Client:
     def getOwnFiles(self):
         return self.getUserFiles(self.getOwnUser().id)
 
+    def getMembershipsTableOfCourses(self, cids, permission=None):
+        """Collects the memberships of all given courses (by id) into a single Table."""
+        table = Table(CourseMembership)
+        for cid in cids:
+            self.getCourseMembershipsTable(cid, permission, table=table)
+        return table
+
     def getCurrentSemester(self):
         """Find the current semester. May return None if no semester found."""
         now = datetime.now(timezone.utc)
@@ -0,0 +1,201 @@
+from array import array
+from dataclasses import fields
+from .models import User, CourseMembership, FileRef, Folder
+
+"""
+Column-oriented result sets for large listings.
+
+A Table stores one list per model field instead of one model instance per row.
+Columns with few distinct values (e.g. 'permission') are dictionary-encoded:
+each distinct value is stored once and rows only hold a small integer code.
+"""
+
+
+# Columns that repeat heavily in typical listings and are encoded by default
+DEFAULT_ENCODED = {
+    User: (),
+    CourseMembership: ("courseId", "permission"),
+    FileRef: ("parent",),
+    Folder: ("type", "parent"),
+}
+
+
+class EncodedColumn:
+    """
+    Dictionary-encoded column: every distinct value is stored once in 'values',
+    rows are stored as indices into 'values' in the compact 'codes' array.
+    """
+
+    __slots__ = ("values", "codes", "_index")
+
+    def __init__(self):
+        self.values = []
+        self.codes = array("I")
+        self._index = {}
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def codeOf(self, value):
+        """Returns the code of a value or None if the value does not occur in this column."""
+        return self._index.get(value)
+
+    def take(self, indices):
+        """Returns a new column holding only the rows at the given indices."""
+        column = EncodedColumn()
+        for i in indices:
+            column.append(self.values[self.codes[i]])
+        return column
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        values = self.values
+        return (values[code] for code in self.codes)
+
+
+class PlainColumn(list):
+    """Column storing values as-is, used for (mostly) unique values such as ids."""
+
+    def take(self, indices):
+        return PlainColumn(self[i] for i in indices)
+
+
+class Table:
+    """
+    Column-oriented collection of models of a single type.
+
+    model: The model class (e.g. 'CourseMembership') whose fields become columns.
+
+    encoded: Names of the columns to dictionary-encode. Defaults to the
+    model's entry in DEFAULT_ENCODED.
+    """
+
+    def __init__(self, model, encoded=None):
+        if encoded is None:
+            encoded = DEFAULT_ENCODED.get(model, ())
+        self.model = model
+        self.names = [field.name for field in fields(model)]
+        for name in encoded:
+            assert name in self.names, "{} has no field '{}'".format(
+                model.__name__, name
+            )
+        self.columns = {
+            name: EncodedColumn() if name in encoded else PlainColumn()
+            for name in self.names
+        }
+        self._length = 0
+
+    @staticmethod
+    def fromModels(model, rows, encoded=None):
+        """Builds a table from an iterable of model instances."""
+        table = Table(model, encoded)
+        table.extend(rows)
+        return table
+
+    @property
+    def encoded(self):
+        return tuple(
+            name
+            for name, column in self.columns.items()
+            if isinstance(column, EncodedColumn)
+        )
+
+    def append(self, row):
+        """Appends a single model instance."""
+        assert isinstance(row, self.model)
+        for name in self.names:
+            self.columns[name].append(getattr(row, name))
+        self._length += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def column(self, name):
+        """Returns the raw column object for the given field name."""
+        return self.columns[name]
+
+    def row(self, i):
+        """Converts a single row back into a model instance."""
+        return self.model(**{name: self.columns[name][i] for name in self.names})
+
+    def toModels(self):
+        """Converts the whole table back into a list of model instances."""
+        return list(self)
+
+    def _take(self, indices):
+        table = Table(self.model, self.encoded)
+        table.columns = {
+            name: column.take(indices) for name, column in self.columns.items()
+        }
+        table._length = len(indices)
+        return table
+
+    def _matching(self, name, value):
+        column = self.columns[name]
+        if isinstance(column, EncodedColumn):
+            # Compare small integer codes instead of the values themselves
+            code = column.codeOf(value)
+            if code is None:
+                return []
+            return [i for i, c in enumerate(column.codes) if c == code]
+        return [i for i, v in enumerate(column) if v == value]
+
+    def filter(self, **conditions):
+        """
+        Returns a new table containing only the rows whose columns equal the given values,
+        e.g. `table.filter(permission="tutor")`.
+        """
+        indices = range(self._length)
+        for name, value in conditions.items():
+            matching = set(self._matching(name, value))
+            indices = [i for i in indices if i in matching]
+        return self._take(list(indices))
+
+    def groupBy(self, name):
+        """Returns a dict mapping each distinct value of a column to a sub-table."""
+        groups = {}
+        column = self.columns[name]
+        if isinstance(column, EncodedColumn):
+            for i, code in enumerate(column.codes):
+                groups.setdefault(code, []).append(i)
+            return {
+                column.values[code]: self._take(indices)
+                for code, indices in groups.items()
+            }
+        for i, value in enumerate(column):
+            groups.setdefault(value, []).append(i)
+        return {value: self._take(indices) for value, indices in groups.items()}
+
+    def valueCounts(self, name):
+        """Returns a dict mapping each distinct value of a column to its number of rows."""
+        column = self.columns[name]
+        counts = {}
+        if isinstance(column, EncodedColumn):
+            for code in column.codes:
+                counts[code] = counts.get(code, 0) + 1
+            return {column.values[code]: count for code, count in counts.items()}
+        for value in column:
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return (self.row(i) for i in range(self._length))
+
+    def __repr__(self):
+        return "Table({}, rows={}, encoded={})".format(
+            self.model.__name__, self._length, self.encoded
+        )
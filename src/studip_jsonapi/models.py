@@ -316,8 +316,8 @@ class CreateAnnouncement:
     """
     title: str
     content: str
-    publicationStart: datetime
-    publicationEnd: datetime
+    publicationStart: datetime = None
+    publicationEnd: datetime = None
     commentsAllowed: bool = False
 
     def __post_init__(self):
@@ -0,0 +1,209 @@
+"""
+HTTP transports used by the Client.
+
+A transport performs the plain HTTP requests of the client (Stage 0). It must
+provide 'get(url)' and 'post(url, headers=None, json=None, files=None)', both
+returning a response object with 'raise_for_status()' and 'json()'.
+
+'raise_for_status()' must raise 'requests.HTTPError' for HTTP error statuses,
+regardless of the backend, so callers can handle errors the same way for every
+transport. Connection and timeout errors are raised as-is by the backend
+(e.g. 'requests.ConnectionError' or 'httpx.ConnectError').
+"""
+import os
+import ssl
+from abc import ABC, abstractmethod
+
+
+class Transport(ABC):
+    @abstractmethod
+    def get(self, url):
+        pass
+
+    @abstractmethod
+    def post(self, url, headers=None, json=None, files=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    Transport based on an (authenticated) instance of 'requests.Session'.
+
+    poolSize: If given, replaces every adapter mounted on the session (including more
+    specific prefixes such as 'https://studip.example.com') by an HTTPAdapter keeping up
+    to 'poolSize' idle connections per host. With the urllib3 default of 10, clients
+    using more threads still get extra connections, but these are discarded after each
+    request, so every further request pays for a new TCP (and TLS) handshake.
+    Each replaced adapter's retry setting is taken over unless 'maxRetries' is given.
+    Without 'poolSize', the adapters of the session are used unchanged.
+    """
+
+    def __init__(self, session, poolSize=None, maxRetries=None):
+        self.session = session
+        if poolSize is not None:
+            from requests.adapters import HTTPAdapter
+
+            for prefix, old in list(session.adapters.items()):
+                session.mount(
+                    prefix,
+                    HTTPAdapter(
+                        pool_connections=poolSize,
+                        pool_maxsize=poolSize,
+                        max_retries=(
+                            maxRetries
+                            if maxRetries is not None
+                            else getattr(old, "max_retries", 0)
+                        ),
+                    ),
+                )
+
+    def get(self, url):
+        return self.session.get(url)
+
+    def post(self, url, headers=None, json=None, files=None):
+        return self.session.post(url, headers=headers, json=json, files=files)
+
+    def close(self):
+        self.session.close()
+
+
+class _HttpxResponse:
+    """Wraps an 'httpx.Response', raising 'requests.HTTPError' for error statuses."""
+
+    def __init__(self, response):
+        self._response = response
+
+    def raise_for_status(self):
+        import httpx
+        from requests import HTTPError
+
+        try:
+            self._response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise HTTPError(str(e), response=self._response) from e
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+def _sslContext(verify, cert):
+    """Translates 'verify' and 'cert' of a 'requests.Session' into an httpx 'verify' value."""
+    if verify is True and cert is None:
+        return True
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        context = ssl.create_default_context()
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+    if cert is not None:
+        if isinstance(cert, tuple):
+            context.load_cert_chain(*cert)
+        else:
+            context.load_cert_chain(cert)
+    return context
+
+
+class HttpxTransport(Transport):
+    """
+    Transport based on 'httpx', multiplexing concurrent requests over HTTP/2
+    connections if the server supports it. Requires 'httpx[http2]>=0.26'.
+
+    session: An authenticated 'requests.Session' whose headers, cookies, auth,
+    'verify', 'cert' and 'proxies' are taken over, so the authentication setup from
+    the README keeps working. Only tuple or 'HTTPBasicAuth' auth can be taken over,
+    any other auth object raises a ValueError.
+    Alternatively, pass a ready-made 'httpx.Client' as 'client'; it is used as-is.
+
+    Like 'requests.Session', the built client follows redirects and has no timeout
+    by default, since large listings may take a long time to answer.
+
+    maxConnections: Upper bound of simultaneously open connections. Further requests
+    wait for a free connection (bounded only by 'timeout').
+
+    timeout: Timeout in seconds (or an 'httpx.Timeout') or None for no timeout.
+    """
+
+    def __init__(
+        self, session=None, client=None, http2=True, maxConnections=100, timeout=None
+    ):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "HttpxTransport requires httpx, install it with 'pip install httpx[http2]>=0.26'"
+            ) from e
+
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=maxConnections,
+                max_keepalive_connections=maxConnections,
+            )
+            verify = True
+            mounts = None
+            auth = None
+            if session is not None:
+                from requests.auth import HTTPBasicAuth
+
+                if session.auth is None or isinstance(session.auth, tuple):
+                    auth = session.auth
+                elif isinstance(session.auth, HTTPBasicAuth):
+                    auth = (session.auth.username, session.auth.password)
+                else:
+                    raise ValueError(
+                        "HttpxTransport cannot take over auth of type {}, "
+                        "pass a configured httpx.Client instead".format(
+                            type(session.auth).__name__
+                        )
+                    )
+                verify = _sslContext(session.verify, session.cert)
+                if session.proxies:
+                    mounts = {
+                        # requests keys proxies by scheme ('https') or by URL prefix
+                        (key + "://" if "://" not in key else key): httpx.HTTPTransport(
+                            proxy=proxy, verify=verify, http2=http2, limits=limits
+                        )
+                        for key, proxy in session.proxies.items()
+                        if key != "no_proxy"
+                    }
+            client = httpx.Client(
+                http2=http2,
+                limits=limits,
+                verify=verify,
+                mounts=mounts,
+                auth=auth,
+                timeout=timeout,
+                follow_redirects=True,
+            )
+            if session is not None:
+                # Connection management is up to httpx, hop-by-hop headers are invalid in HTTP/2
+                client.headers.update(
+                    {
+                        name: value
+                        for name, value in session.headers.items()
+                        if name.lower() not in ("connection", "keep-alive")
+                    }
+                )
+                for cookie in session.cookies:
+                    client.cookies.set(
+                        cookie.name, cookie.value, domain=cookie.domain, path=cookie.path
+                    )
+        self.client = client
+
+    def get(self, url):
+        return _HttpxResponse(self.client.get(url))
+
+    def post(self, url, headers=None, json=None, files=None):
+        return _HttpxResponse(
+            self.client.post(url, headers=headers, json=json, files=files)
+        )
+
+    def close(self):
+        self.client.close()